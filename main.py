@@ -1,49 +1,47 @@
 from __future__ import annotations
 
 import argparse
+import re
 from typing import Tuple, Union
 
 from video_builder import VideoBuilder, Text, Arrow
 
 
+# Precompiled patterns so each argument is parsed in a single match, without int() fallbacks
+_INT_RE = re.compile(r"[-+]?\d+")
+_SIZE_RE = re.compile(r"\s*([-+]?\d+)\s*x\s*([-+]?\d+)\s*", re.IGNORECASE)
+_POSITION_RE = re.compile(r"\s*([^,]*?)\s*(?:,\s*(.*?)\s*)?", re.DOTALL)
+_ARROW_RE = re.compile(r"\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*,\s*([-+]?\d+)\s*")
+
+
 def parse_size(size_str: str) -> Tuple[int, int]:
-    try:
-        w_str, h_str = size_str.lower().split("x")
-        return int(w_str), int(h_str)
-    except Exception:
+    m = _SIZE_RE.fullmatch(size_str)
+    if m is None:
         return 1920, 1080
+    return int(m.group(1)), int(m.group(2))
 
 
-def parse_position(pos_str: str) -> Union[str, Tuple[Union[str, int], Union[str, int]]]:
-    # Accept forms like "center,150" or "960,540" or "center,center" or "center"
-    if "," not in pos_str:
-        token = pos_str.strip()
-        if token == "center":
-            return "center"
-        try:
-            return int(token), int(token)  # unlikely, but keep symmetry
-        except Exception:
-            return "center"
-
-    x_str, y_str = [t.strip() for t in pos_str.split(",", 1)]
+def _parse_position_token(tok: str) -> Union[str, int]:
+    return int(tok) if _INT_RE.fullmatch(tok) else "center"
 
-    def parse_token(tok: str) -> Union[str, int]:
-        if tok == "center":
-            return "center"
-        try:
-            return int(tok)
-        except Exception:
-            return "center"
 
-    return parse_token(x_str), parse_token(y_str)
+def parse_position(pos_str: str) -> Union[str, Tuple[Union[str, int], Union[str, int]]]:
+    # Accept forms like "center,150" or "960,540" or "center,center" or "center"
+    x_str, y_str = _POSITION_RE.fullmatch(pos_str).groups()
+    if y_str is None:
+        if _INT_RE.fullmatch(x_str):
+            value = int(x_str)
+            return value, value  # unlikely, but keep symmetry
+        return "center"
+    return _parse_position_token(x_str), _parse_position_token(y_str)
 
 
 def parse_arrow(arrow_str: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
     # Accept "x1,y1,x2,y2"
-    parts = [p.strip() for p in arrow_str.split(",")]
-    if len(parts) != 4:
+    m = _ARROW_RE.fullmatch(arrow_str)
+    if m is None:
         raise ValueError("--arrow must be in the form x1,y1,x2,y2")
-    x1, y1, x2, y2 = map(int, parts)
+    x1, y1, x2, y2 = map(int, m.groups())
     return (x1, y1), (x2, y2)
 
 
@@ -52,6 +50,27 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--output", default="output.mp4", help="Output video path (mp4)")
     p.add_argument("--size", default="1920x1080", help="Canvas size as WIDTHxHEIGHT, e.g. 1920x1080")
     p.add_argument("--fps", type=int, default=30, help="Frames per second")
+    p.add_argument(
+        "--renderer",
+        choices=["ffmpeg", "moviepy"],
+        default="ffmpeg",
+        help="Render natively with an ffmpeg filtergraph, or frame-by-frame through MoviePy (fallback)",
+    )
+    p.add_argument(
+        "--no-hw-encode",
+        action="store_true",
+        help="Always encode with libx264 instead of an available NVENC/VAAPI hardware encoder",
+    )
+    p.add_argument(
+        "--segmented",
+        action="store_true",
+        help="With the ffmpeg renderer, encode each timeline entry separately and join them with the concat demuxer",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        help="Number of timeline entries encoded in parallel with --segmented (default: CPU count)",
+    )
 
     # Title / text screen
     p.add_argument("--text", help="Title text for a full-screen text intro")
@@ -102,7 +121,7 @@ def main() -> None:
 
     size = parse_size(args.size)
 
-    editor = VideoBuilder(args.output, size=size, fps=args.fps)
+    editor = VideoBuilder(args.output, size=size, fps=args.fps, hardware_encoding=not args.no_hw_encode)
 
     # Optional title text screen
     if args.text:
@@ -146,11 +165,14 @@ def main() -> None:
             arrow_clip,
             start_time=args.arrow_start,
             duration=args.arrow_duration,
-            position=(0, 0),  # Arrow is drawn in absolute canvas coordinates, so position is (0, 0)
+            position=(0, 0),  # Arrow is laid out in absolute canvas coordinates, so no extra translation
         )
 
     # Render
-    editor.render()
+    if args.renderer == "ffmpeg":
+        editor.render_ffmpeg(segmented=args.segmented, workers=args.workers)
+    else:
+        editor.render()
 
     print("Video generation complete!")
 
@@ -9,17 +9,37 @@ Core ideas:
 Notes:
 - Text and graphics rendering use Pillow, avoiding ImageMagick requirements.
 - All timeline clips are resized with letterboxing to a consistent canvas size to ensure overlays align reliably.
+- Two render paths are available: `render()` composites frame-by-frame through MoviePy, while
+  `render_ffmpeg()` expresses the whole timeline as a single ffmpeg filtergraph and lets ffmpeg
+  do the decoding, letterboxing, overlaying and encoding natively.
 """
 
 from __future__ import annotations
 
 from typing import Optional, Tuple, Union
+import functools
 import math
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import moviepy.editor as mp
 import moviepy.video.fx.all as vfx
-from PIL import Image, ImageDraw, ImageFont
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+try:
+    import cv2
+except ImportError:  # OpenCV is optional; fall back to MoviePy's own resize/compositing
+    cv2 = None
+
+try:
+    import numba
+except ImportError:  # Numba is optional; overlays are then blended with plain NumPy
+    numba = None
 
 
 Size = Tuple[int, int]
@@ -27,30 +47,76 @@ Point = Tuple[int, int]
 Position = Union[str, Tuple[Union[str, int], Union[str, int]]]
 
 
-def _load_font(fontsize: int) -> ImageFont.ImageFont:
+@functools.lru_cache(maxsize=32)
+def _load_font(fontsize: int, font_path: str = "arial.ttf") -> ImageFont.ImageFont:
     """Best-effort load of a TTF font, falling back to PIL's default.
 
     On Windows, Arial is commonly available; if not, we fall back gracefully.
+    Fonts are cached per (fontsize, font_path), fallback included, so the TTF file and
+    FreeType face are only loaded once. Callers must not mutate the returned font.
     """
     try:
-        return ImageFont.truetype("arial.ttf", fontsize)
+        return ImageFont.truetype(font_path, fontsize)
     except Exception:
         return ImageFont.load_default()
 
 
-def _pil_rgba_to_imageclip(img: Image.Image, duration: float) -> mp.ImageClip:
-    """Convert a PIL RGBA image to a MoviePy ImageClip with alpha preserved."""
+# Rasterized Text overlays keyed by (text, fontsize, str(color), padding); values are
+# read-only (rgb, alpha) uint8 arrays shared by every clip built from them.
+_TEXT_CACHE: dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _split_rgba(img: Image.Image) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a PIL image into contiguous uint8 RGB (HxWx3) and alpha (HxW) arrays."""
     if img.mode != "RGBA":
         img = img.convert("RGBA")
-    arr = np.array(img).astype("uint8")
-    rgb = arr[..., :3]
-    alpha = (arr[..., 3] / 255.0).astype("float32")
+    # Wrap Pillow's raw buffer directly instead of going through np.array(img)
+    arr = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width, 4)
+    return np.ascontiguousarray(arr[..., :3]), np.ascontiguousarray(arr[..., 3])
+
 
+def _imageclip_from_arrays(rgb: np.ndarray, alpha: np.ndarray, duration: float) -> mp.ImageClip:
+    """Build a MoviePy ImageClip from uint8 RGB and alpha arrays."""
     base = mp.ImageClip(rgb).set_duration(duration)
-    mask = mp.ImageClip(alpha, ismask=True).set_duration(duration)
+    # Fully opaque images (e.g. title screens) need no mask at all
+    if np.all(alpha == 255):
+        return base
+
+    mask_arr = alpha.astype(np.float32)
+    np.multiply(mask_arr, 1.0 / 255.0, out=mask_arr)
+    mask = mp.ImageClip(mask_arr, ismask=True).set_duration(duration)
     return base.set_mask(mask)
 
 
+def _pil_rgba_to_imageclip(img: Image.Image, duration: float) -> mp.ImageClip:
+    """Convert a PIL RGBA image to a MoviePy ImageClip with alpha preserved.
+
+    RGB images have no alpha to preserve and become a mask-less clip over a read-only
+    view of the image buffer.
+    """
+    if img.mode == "RGB":
+        rgb = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width, 3)
+        return mp.ImageClip(rgb).set_duration(duration)
+    rgb, alpha = _split_rgba(img)
+    return _imageclip_from_arrays(rgb, alpha, duration)
+
+
+# Shared 1x1 draw context used only for measuring multi-line text
+_METRIC_DRAW = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+
+@functools.lru_cache(maxsize=256)
+def _multiline_text_bbox(font: ImageFont.ImageFont, text: str, align: str) -> Tuple[int, int, int, int]:
+    """Measure text once per (font, text, align); fonts come from the _load_font cache.
+
+    Single-line text is measured with the font's own getbbox, skipping the multi-line layout.
+    """
+    if "\n" not in text:
+        return font.getbbox(text)
+    return _METRIC_DRAW.multiline_textbbox((0, 0), text, font=font, align=align)
+
+
+@functools.lru_cache(maxsize=16)
 def _draw_centered_text_image(
     canvas_size: Size,
     text: str,
@@ -58,15 +124,19 @@ def _draw_centered_text_image(
     text_color: Union[str, Tuple[int, int, int]] = "white",
     bg_color: Union[str, Tuple[int, int, int]] = "black",
 ) -> Image.Image:
-    """Create a full-size RGBA image with centered text on a solid background."""
+    """Create a full-size RGB image with centered text on a solid background.
+
+    Results are cached per argument tuple; the returned image is shared, so callers
+    must ``.copy()`` it before mutating.
+    """
     width, height = canvas_size
-    img = Image.new("RGBA", (width, height), color=bg_color if isinstance(bg_color, tuple) else bg_color)
+    img = Image.new("RGB", (width, height), color=bg_color if isinstance(bg_color, tuple) else bg_color)
     draw = ImageDraw.Draw(img)
     font = _load_font(fontsize)
 
     # Compute multi-line text box and center it
     # Use multiline_textbbox for accurate size (Pillow >= 8.0)
-    bbox = draw.multiline_textbbox((0, 0), text, font=font, align="center")
+    bbox = _multiline_text_bbox(font, text, "center")
     text_w = bbox[2] - bbox[0]
     text_h = bbox[3] - bbox[1]
     x = (width - text_w) // 2
@@ -85,9 +155,7 @@ def _draw_text_image_tight(
     """Create a tight RGBA image around the rendered text (useful for overlays)."""
     font = _load_font(fontsize)
     # Measure text box
-    dummy_img = Image.new("RGBA", (2, 2), (0, 0, 0, 0))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    bbox = dummy_draw.multiline_textbbox((0, 0), text, font=font, align="left")
+    bbox = _multiline_text_bbox(font, text, "left")
     text_w = max(1, bbox[2] - bbox[0])
     text_h = max(1, bbox[3] - bbox[1])
 
@@ -97,6 +165,14 @@ def _draw_text_image_tight(
     return img
 
 
+def _fit_size(size: Size, target_size: Size) -> Size:
+    """Largest size with the aspect ratio of ``size`` that fits within ``target_size``."""
+    target_w, target_h = target_size
+    cw, ch = size
+    scale = min(target_w / cw, target_h / ch)
+    return int(round(cw * scale)), int(round(ch * scale))
+
+
 def _resize_and_letterbox(
     clip: mp.VideoClip,
     target_size: Size,
@@ -106,15 +182,13 @@ def _resize_and_letterbox(
 
     Audio is preserved from the original clip.
     """
-    target_w, target_h = target_size
-    cw, ch = clip.size
+    new_w, new_h = _fit_size(clip.size, target_size)
 
-    scale = min(target_w / cw, target_h / ch)
-    new_w = int(round(cw * scale))
-    new_h = int(round(ch * scale))
+    if cv2 is not None:
+        return _cv2_resize_and_letterbox(clip, (new_w, new_h), target_size, bg_color)
 
-    resized = clip.resize(newsize=(new_w, new_h))
-    if (new_w, new_h) == (target_w, target_h):
+    resized = clip if (new_w, new_h) == tuple(clip.size) else clip.resize(newsize=(new_w, new_h))
+    if (new_w, new_h) == tuple(target_size):
         return resized
 
     bg = mp.ColorClip(size=target_size, color=bg_color, duration=clip.duration)
@@ -125,6 +199,334 @@ def _resize_and_letterbox(
     return composed
 
 
+def _cv2_resize_and_letterbox(
+    clip: mp.VideoClip,
+    new_size: Size,
+    target_size: Size,
+    bg_color: Tuple[int, int, int],
+) -> mp.VideoClip:
+    """OpenCV implementation of _resize_and_letterbox as a single per-frame transform.
+
+    Frames are resized with cv2 and copied into one reused canvas buffer whose letterbox
+    bars are filled once, instead of compositing the clip over a ColorClip every frame.
+    The returned frames share that buffer, so copy a frame before holding on to it.
+    """
+    new_w, new_h = new_size
+    target_w, target_h = target_size
+    cw, ch = clip.size
+    needs_resize = (new_w, new_h) != (cw, ch)
+    interpolation = cv2.INTER_AREA if new_w < cw else cv2.INTER_LINEAR
+
+    def resize(frame: np.ndarray) -> np.ndarray:
+        return cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+
+    if (new_w, new_h) == (target_w, target_h):
+        return clip.fl_image(resize) if needs_resize else clip
+
+    x0 = (target_w - new_w) // 2
+    y0 = (target_h - new_h) // 2
+    canvas = np.full((target_h, target_w, 3), bg_color, dtype=np.uint8)
+    window = canvas[y0 : y0 + new_h, x0 : x0 + new_w]
+
+    def letterbox(frame: np.ndarray) -> np.ndarray:
+        np.copyto(window, resize(frame) if needs_resize else frame, casting="unsafe")
+        return canvas
+
+    letterboxed = clip.fl_image(letterbox)
+    # Preserve audio track
+    if clip.audio is not None:
+        letterboxed = letterboxed.set_audio(clip.audio)
+    return letterboxed
+
+
+# Same expansion MoviePy applies to string positions (see VideoClip.blit_on)
+_POSITION_NAMES = {
+    "center": ("center", "center"),
+    "left": ("left", "center"),
+    "right": ("right", "center"),
+    "top": ("center", "top"),
+    "bottom": ("center", "bottom"),
+}
+
+
+def _resolve_position(position: Position, overlay_size: Size, canvas_size: Size) -> Point:
+    """Resolve a MoviePy-style position into absolute top-left pixel coordinates on the canvas."""
+    if isinstance(position, str):
+        if position not in _POSITION_NAMES:
+            raise ValueError(f"Unknown position: {position!r}")
+        position = _POSITION_NAMES[position]
+
+    def resolve_axis(value: Union[str, int], overlay_len: int, canvas_len: int, start: str, end: str) -> int:
+        if value == "center":
+            return (canvas_len - overlay_len) // 2
+        if value == start:
+            return 0
+        if value == end:
+            return canvas_len - overlay_len
+        if isinstance(value, str):
+            raise ValueError(f"Unknown position: {value!r}")
+        return int(value)
+
+    return (
+        resolve_axis(position[0], overlay_size[0], canvas_size[0], "left", "right"),
+        resolve_axis(position[1], overlay_size[1], canvas_size[1], "top", "bottom"),
+    )
+
+
+def _parse_rgba(color: Union[str, Tuple[int, ...]]) -> Tuple[int, int, int, int]:
+    """Normalize a Pillow color name or RGB(A) tuple into an RGBA tuple."""
+    rgba = ImageColor.getrgb(color) if isinstance(color, str) else tuple(color)
+    return (rgba[0], rgba[1], rgba[2], rgba[3] if len(rgba) > 3 else 255)
+
+
+def _ffmpeg_color(color: Tuple[int, int, int]) -> str:
+    """Format an RGB tuple as an ffmpeg color literal."""
+    return "0x{:02x}{:02x}{:02x}".format(*color)
+
+
+# --- Video encoder selection ---
+
+
+def _is_even_size(size: Size) -> bool:
+    return size[0] % 2 == 0 and size[1] % 2 == 0
+
+
+class _VideoEncoder:
+    """An ffmpeg H.264 encoder and the options needed to drive it."""
+
+    def __init__(
+        self,
+        codec: str,
+        preset: Optional[str] = None,
+        options: Tuple[str, ...] = (),
+        device: Optional[str] = None,
+        hw_upload: Optional[str] = None,
+        still_preset: Optional[str] = None,
+        still_options: Tuple[str, ...] = (),
+    ) -> None:
+        self.codec = codec
+        self.preset = preset
+        self.options = options
+        # Overrides for segments that are a single repeated image (title screens, freeze frames)
+        self.still_preset = still_preset or preset
+        self.still_options = still_options
+        self.device = device          # VAAPI render node, if the encoder needs one
+        self.hw_upload = hw_upload    # filter moving frames onto the device, if needed
+
+    @property
+    def global_args(self) -> list[str]:
+        return ["-vaapi_device", self.device] if self.device else []
+
+    def output_filter(self, size: Size) -> str:
+        """Last filter of a filtergraph feeding this encoder frames of the given size."""
+        if self.hw_upload:
+            return self.hw_upload
+        # 4:2:0 chroma needs even dimensions; otherwise keep full chroma like MoviePy's libx264 output
+        return "format=yuv420p" if _is_even_size(size) else "format=yuv444p"
+
+    def codec_args(self, still: bool = False) -> list[str]:
+        args = ["-c:v", self.codec]
+        preset = self.still_preset if still else self.preset
+        if preset:
+            args += ["-preset", preset]
+        if still:
+            args += list(self.still_options)
+        return args + list(self.options)
+
+    def moviepy_params(self) -> list[str]:
+        """Extra ffmpeg_params for MoviePy's write_videofile, which sets -vcodec/-preset itself."""
+        params = self.global_args + list(self.options)
+        if self.hw_upload:
+            params += ["-vf", self.hw_upload]
+        return params
+
+
+# No -pix_fmt here: MoviePy adds yuv420p for libx264 itself when the frame size allows it
+_SOFTWARE_ENCODER = _VideoEncoder(
+    "libx264",
+    preset="medium",
+    still_preset="veryfast",
+    still_options=("-tune", "stillimage"),
+)
+_HARDWARE_ENCODERS = (
+    _VideoEncoder(
+        "h264_nvenc",
+        preset="medium",
+        options=("-rc", "vbr", "-cq", "23", "-b:v", "0", "-pix_fmt", "yuv420p"),
+    ),
+    _VideoEncoder("h264_vaapi", device="/dev/dri/renderD128", hw_upload="format=nv12,hwupload"),
+)
+
+
+def _encoder_works(ffmpeg: str, encoder: _VideoEncoder) -> bool:
+    """Encode one tiny frame to check the encoder is usable, not merely compiled in."""
+    if encoder.device and not os.path.exists(encoder.device):
+        return False
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error"] + encoder.global_args
+    cmd += ["-f", "lavfi", "-i", "color=black:s=256x256:r=1", "-frames:v", "1"]
+    cmd += ["-vf", encoder.output_filter((256, 256))]
+    cmd += encoder.codec_args() + ["-f", "null", "-"]
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _select_video_encoder(hardware: bool = True) -> _VideoEncoder:
+    """Pick NVENC or VAAPI when ffmpeg provides one that works on this machine, else libx264.
+
+    Probing spawns ffmpeg, so it happens on first render rather than at import, and is cached.
+    """
+    if not hardware:
+        return _SOFTWARE_ENCODER
+    ffmpeg = get_setting("FFMPEG_BINARY")
+    try:
+        listing = subprocess.run([ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True).stdout
+    except OSError:
+        return _SOFTWARE_ENCODER
+    for encoder in _HARDWARE_ENCODERS:
+        if f" {encoder.codec} " in listing and _encoder_works(ffmpeg, encoder):
+            return encoder
+    return _SOFTWARE_ENCODER
+
+
+# --- Timeline bookkeeping for the ffmpeg render path ---
+
+
+class _StillSegment:
+    """A canvas-sized still image held on screen for a fixed duration (title screens, freeze frames)."""
+
+    def __init__(self, image: Image.Image, duration: float) -> None:
+        self.image = image
+        self.duration = duration
+
+
+class _FileSegment:
+    """A trimmed span of a source video file, letterboxed to the canvas."""
+
+    def __init__(
+        self,
+        filepath: str,
+        start_time: float,
+        duration: float,
+        fade_in: float,
+        fade_out: float,
+        letterbox_bg: Tuple[int, int, int],
+        has_audio: bool,
+    ) -> None:
+        self.filepath = filepath
+        self.start_time = start_time
+        self.duration = duration
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+        self.letterbox_bg = letterbox_bg
+        self.has_audio = has_audio
+
+
+class _OverlaySpec:
+    """A static RGBA overlay placed at absolute canvas pixels for a time window."""
+
+    def __init__(
+        self,
+        rgb: np.ndarray,
+        alpha: np.ndarray,
+        start_time: float,
+        duration: float,
+        position: Point,
+    ) -> None:
+        self.rgb = rgb
+        self.alpha = alpha
+        self.start_time = start_time
+        self.duration = duration
+        self.position = position
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.duration
+
+
+if numba is not None:
+
+    @numba.njit(parallel=True, cache=True, boundscheck=False)
+    def _blend_rgba(dst, ov_rgb, ov_alpha, x, y):
+        """In-place ``dst = ov + ((255 - a) * dst + 127) // 255`` for premultiplied ov, rows in parallel."""
+        h, w = ov_alpha.shape
+        for r in numba.prange(h):
+            for c in range(w):
+                inv = 255 - np.int32(ov_alpha[r, c])
+                if inv == 255:
+                    continue
+                for ch in range(3):
+                    kept = (inv * np.int32(dst[y + r, x + c, ch]) + 127) // 255
+                    dst[y + r, x + c, ch] = np.int32(ov_rgb[r, c, ch]) + kept
+
+else:
+    _blend_rgba = None
+
+
+class _BakedOverlay:
+    """An _OverlaySpec clipped to the canvas with its blend inputs prepared.
+
+    The overlay colour is premultiplied by its alpha once up front, so blending is a single
+    integer multiply per channel: ``dst = rgb_pm + ((255 - alpha) * dst + 127) // 255``.
+    With Numba the fused _blend_rgba kernel is used, otherwise a vectorized NumPy blend.
+    """
+
+    def __init__(self, spec: _OverlaySpec, canvas_size: Size) -> None:
+        x, y = spec.position
+        h, w = spec.alpha.shape
+        # Intersect the overlay rectangle with the canvas
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, canvas_size[0]), min(y + h, canvas_size[1])
+        self.start_time = spec.start_time
+        self.end_time = spec.end_time
+        self.visible = x0 < x1 and y0 < y1
+        self.origin = (x0, y0)
+        self.dst_window = (slice(y0, y1), slice(x0, x1))
+        src_window = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+        alpha = np.ascontiguousarray(spec.alpha[src_window])
+        weighted = alpha[..., None].astype(np.uint16) * spec.rgb[src_window] + 127
+        self.rgb_pm = (weighted // 255).astype(np.uint8)
+        if _blend_rgba is not None:
+            self.alpha = alpha
+        else:
+            self.inv_alpha = (255 - alpha[..., None]).astype(np.uint16)
+
+    def is_active(self, t: float) -> bool:
+        return self.visible and self.start_time <= t < self.end_time
+
+    def blend_into(self, frame: np.ndarray) -> None:
+        if _blend_rgba is not None:
+            _blend_rgba(frame, self.rgb_pm, self.alpha, self.origin[0], self.origin[1])
+            return
+        region = frame[self.dst_window]
+        region[...] = self.rgb_pm + (self.inv_alpha * region + 127) // 255
+
+
+class _OverlayBlender:
+    """Frame transform for clip.fl that blends baked overlays into one reused frame buffer.
+
+    Source frames may be shared (e.g. an ImageClip's image), so they are copied into the
+    scratch buffer before blending; the buffer is returned and overwritten on the next frame.
+    """
+
+    def __init__(self, overlays: list[_BakedOverlay], frame_size: Size) -> None:
+        self.overlays = overlays
+        self.scratch = np.empty((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+
+    def __call__(self, get_frame, t: float) -> np.ndarray:
+        frame = get_frame(t)
+        active = [ov for ov in self.overlays if ov.is_active(t)]
+        if not active:
+            return frame
+        np.copyto(self.scratch, frame, casting="unsafe")
+        for ov in active:
+            ov.blend_into(self.scratch)
+        return self.scratch
+
+
 # --- Annotation Helper Classes ---
 
 
@@ -146,35 +548,79 @@ class Arrow:
         self.stroke_width = stroke_width
         self.head_length = head_length
         self.head_angle_deg = head_angle_deg
+        self._cos_t = math.cos(math.radians(head_angle_deg))
+        self._sin_t = math.sin(math.radians(head_angle_deg))
+        # Canvas coordinates of the top-left corner of the last image from as_image()
+        self.offset: Point = (0, 0)
 
     def as_clip(self, duration: float, video_size: Size) -> mp.ImageClip:
-        # Create transparent canvas
-        img = Image.new("RGBA", video_size, (255, 255, 255, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.as_image(video_size)
+        return _pil_rgba_to_imageclip(img, duration).set_position(self.offset)
 
-        # Draw main shaft
-        draw.line([self.start_pos, self.end_pos], fill=self.color, width=self.stroke_width)
-
-        # Draw arrowhead oriented to the line direction
-        dx = self.end_pos[0] - self.start_pos[0]
-        dy = self.end_pos[1] - self.start_pos[1]
-        angle = math.atan2(dy, dx)
-        theta = math.radians(self.head_angle_deg)
+    def as_image(self, video_size: Size) -> Image.Image:
+        """Rasterize the arrow into an image just large enough to hold it.
 
-        left_angle = angle + math.pi - theta
-        right_angle = angle + math.pi + theta
+        The arrow is laid out in absolute canvas coordinates; the canvas position of the
+        image's top-left corner is stored in ``self.offset``.
+        """
+        # Arrowhead oriented to the line direction: rotate the unit vector pointing back
+        # along the shaft by -/+ head_angle_deg (cos/sin precomputed in __init__)
+        ex, ey = self.end_pos
+        dx = ex - self.start_pos[0]
+        dy = ey - self.start_pos[1]
+        length = math.hypot(dx, dy)
+        ux, uy = (-dx / length, -dy / length) if length else (-1.0, 0.0)
+        cos_t, sin_t, hl = self._cos_t, self._sin_t, self.head_length
 
         left_point = (
-            int(self.end_pos[0] + self.head_length * math.cos(left_angle)),
-            int(self.end_pos[1] + self.head_length * math.sin(left_angle)),
+            int(ex + hl * (ux * cos_t + uy * sin_t)),
+            int(ey + hl * (uy * cos_t - ux * sin_t)),
         )
         right_point = (
-            int(self.end_pos[0] + self.head_length * math.cos(right_angle)),
-            int(self.end_pos[1] + self.head_length * math.sin(right_angle)),
+            int(ex + hl * (ux * cos_t - uy * sin_t)),
+            int(ey + hl * (uy * cos_t + ux * sin_t)),
         )
-        draw.polygon([self.end_pos, left_point, right_point], fill=self.color)
 
-        return _pil_rgba_to_imageclip(img, duration)
+        # Tight bounding box around shaft and head, padded to cover the stroke width
+        points = [self.start_pos, self.end_pos, left_point, right_point]
+        pad = self.stroke_width
+        min_x = min(p[0] for p in points) - pad
+        min_y = min(p[1] for p in points) - pad
+        max_x = max(p[0] for p in points) + pad
+        max_y = max(p[1] for p in points) + pad
+        self.offset = (min_x, min_y)
+
+        def local(p: Point) -> Point:
+            return p[0] - min_x, p[1] - min_y
+
+        bw, bh = max_x - min_x + 1, max_y - min_y + 1
+        if cv2 is not None:
+            # Rasterize the anti-aliased shape coverage into the alpha channel only; the colour
+            # channels are flat, which keeps the RGBA straight (non-premultiplied) at the edges.
+            rgba = _parse_rgba(self.color)
+            coverage = np.zeros((bh, bw), dtype=np.uint8)
+            # cv2 lines have round caps, so stop the shaft at the head's base rather than its tip
+            base = (int(ex + hl * cos_t * ux), int(ey + hl * cos_t * uy))
+            cv2.line(coverage, local(self.start_pos), local(base), 255, max(1, self.stroke_width), cv2.LINE_AA)
+            head = np.array([local(self.end_pos), local(left_point), local(right_point)], dtype=np.int32)
+            cv2.fillConvexPoly(coverage, head, 255, cv2.LINE_AA)
+
+            canvas = np.empty((bh, bw, 4), dtype=np.uint8)
+            canvas[..., :3] = rgba[:3]
+            if rgba[3] == 255:
+                canvas[..., 3] = coverage
+            else:
+                canvas[..., 3] = (coverage.astype(np.uint16) * rgba[3] + 127) // 255
+            return Image.fromarray(canvas, "RGBA")
+
+        # Create transparent canvas
+        img = Image.new("RGBA", (bw, bh), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(img)
+
+        # Draw main shaft
+        draw.line([local(self.start_pos), local(self.end_pos)], fill=self.color, width=self.stroke_width)
+        draw.polygon([local(self.end_pos), local(left_point), local(right_point)], fill=self.color)
+        return img
 
 
 class Text:
@@ -193,20 +639,48 @@ class Text:
         self.padding = padding
 
     def as_clip(self, duration: float) -> mp.ImageClip:
-        img = _draw_text_image_tight(self.text, self.fontsize, self.color, padding=self.padding)
-        return _pil_rgba_to_imageclip(img, duration)
+        rgb, alpha = self.as_arrays()
+        return _imageclip_from_arrays(rgb, alpha, duration)
+
+    def as_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the rasterized text as shared, read-only uint8 (rgb, alpha) arrays.
+
+        Identical texts are only rasterized once per process.
+        """
+        key = (self.text, self.fontsize, str(self.color), self.padding)
+        cached = _TEXT_CACHE.get(key)
+        if cached is None:
+            img = _draw_text_image_tight(self.text, self.fontsize, self.color, padding=self.padding)
+            cached = _split_rgba(img)
+            for arr in cached:
+                arr.setflags(write=False)
+            _TEXT_CACHE[key] = cached
+        return cached
 
 
 # --- The Main Builder Class ---
 
 
 class VideoBuilder:
-    def __init__(self, output_path: str, size: Size = (1920, 1080), fps: int = 30) -> None:
+    def __init__(
+        self,
+        output_path: str,
+        size: Size = (1920, 1080),
+        fps: int = 30,
+        hardware_encoding: bool = True,
+    ) -> None:
         self.output_path = output_path
         self.size: Size = size
         self.fps: int = fps
+        # Use an NVENC/VAAPI H.264 encoder when one is available, falling back to libx264
+        self.hardware_encoding = hardware_encoding
         self.timeline_clips: list[mp.VideoClip] = []  # Main sequential clips
-        self.overlay_clips: list[mp.VideoClip] = []   # Timed overlays
+        # Parallel description of the timeline consumed by render_ffmpeg()
+        self.timeline_segments: list[Union[_StillSegment, _FileSegment]] = []
+        # Timed overlays added with add_overlay(); both renderers read these
+        self.overlay_specs: list[_OverlaySpec] = []
+        # Extra MoviePy clips composited on top by render() only (add_overlay does not use it)
+        self.overlay_clips: list[mp.VideoClip] = []
 
     # --- Timeline methods ---
     def add_text_screen(
@@ -218,9 +692,10 @@ class VideoBuilder:
         bg_color: Union[str, Tuple[int, int, int]] = "black",
     ) -> None:
         """Adds a full screen of text on a solid background."""
-        img = _draw_centered_text_image(self.size, text, fontsize=fontsize, text_color=color, bg_color=bg_color)
+        img = _draw_centered_text_image(tuple(self.size), text, fontsize=fontsize, text_color=color, bg_color=bg_color)
         clip = _pil_rgba_to_imageclip(img, duration).set_fps(self.fps)
         self.timeline_clips.append(clip)
+        self.timeline_segments.append(_StillSegment(img, duration))
 
     def add_clip(
         self,
@@ -232,11 +707,27 @@ class VideoBuilder:
         letterbox_bg: Tuple[int, int, int] = (0, 0, 0),
     ) -> None:
         """Adds a video clip from a file, with optional trimming, fades, and letterboxing to canvas size."""
-        base_clip = mp.VideoFileClip(filepath)
+        # Let ffmpeg decode straight to the letterboxed size so no per-frame resize is needed.
+        # Seeking for the subclip already happens on the ffmpeg input side.
+        infos = ffmpeg_parse_infos(filepath)
+        target_resolution = None
+        if infos.get("video_rotation", 0) not in (90, 270):
+            fit_w, fit_h = _fit_size(infos["video_size"], self.size)
+            target_resolution = (fit_h, fit_w)
+        base_clip = mp.VideoFileClip(filepath, target_resolution=target_resolution)
         if end_time is not None:
             clip = base_clip.subclip(start_time, end_time)
         else:
             clip = base_clip.subclip(start_time)
+        segment = _FileSegment(
+            filepath,
+            start_time=start_time,
+            duration=clip.duration,
+            fade_in=fade_in or 0,
+            fade_out=fade_out or 0,
+            letterbox_bg=letterbox_bg,
+            has_audio=clip.audio is not None,
+        )
 
         # Conform clip to builder canvas with letterboxing (preserve aspect ratio)
         clip = _resize_and_letterbox(clip, self.size, bg_color=letterbox_bg)
@@ -247,6 +738,7 @@ class VideoBuilder:
             clip = vfx.fadeout(clip, fade_out)
 
         self.timeline_clips.append(clip)
+        self.timeline_segments.append(segment)
 
     def add_freeze_frame(self, duration: float, at_time: float) -> None:
         """Adds a freeze frame taken from the previous clip at the given time (in seconds).
@@ -258,12 +750,15 @@ class VideoBuilder:
 
         previous_clip = self.timeline_clips[-1]
         sample_t = max(0.0, min(at_time, max(0.0, previous_clip.duration - 1e-3)))
-        frame = previous_clip.get_frame(sample_t)
+        # Copy, as letterboxed clips may hand out a reused frame buffer; fades yield float frames,
+        # which are truncated to uint8 the same way MoviePy's writer does
+        frame = np.array(previous_clip.get_frame(sample_t), dtype=np.uint8)
 
         freeze_clip = mp.ImageClip(frame).set_duration(duration).set_fps(self.fps)
         # Conform to canvas to align with overlays/timeline
         freeze_clip = _resize_and_letterbox(freeze_clip, self.size)
         self.timeline_clips.append(freeze_clip)
+        self.timeline_segments.append(_StillSegment(Image.fromarray(freeze_clip.get_frame(0)), duration))
 
     # --- Overlays ---
     def add_overlay(
@@ -278,40 +773,302 @@ class VideoBuilder:
         position can be a string (e.g., 'center') or a tuple, e.g., ("center", 150) or (x, y)
         """
         if isinstance(overlay_obj, Arrow):
-            clip = overlay_obj.as_clip(duration, self.size)
+            rgb, alpha = _split_rgba(overlay_obj.as_image(self.size))
+            # Arrows are laid out in canvas coordinates; position acts as a canvas-sized layer
+            # placement, i.e. a translation that is zero for ("center", "center") and (0, 0).
+            shift_x, shift_y = _resolve_position(position, self.size, self.size)
+            xy = (overlay_obj.offset[0] + shift_x, overlay_obj.offset[1] + shift_y)
         elif isinstance(overlay_obj, Text):
-            clip = overlay_obj.as_clip(duration)
+            rgb, alpha = overlay_obj.as_arrays()
+            xy = _resolve_position(position, (rgb.shape[1], rgb.shape[0]), self.size)
         else:
             raise TypeError("Unsupported overlay object type.")
 
-        clip = clip.set_start(start_time).set_position(position)
-        self.overlay_clips.append(clip)
+        self.overlay_specs.append(_OverlaySpec(rgb, alpha, start_time, duration, xy))
 
     # --- Render ---
+    def _video_encoder(self) -> _VideoEncoder:
+        # Hardware encoders only take 4:2:0 input, so odd canvas sizes go to libx264
+        return _select_video_encoder(self.hardware_encoding and _is_even_size(self.size))
+
     def render(self) -> None:
-        """Concatenates timeline clips, composites overlays, and writes the final video file."""
+        """Concatenates timeline clips, blends overlays on top, and writes the final video file."""
         if not self.timeline_clips:
             print("Timeline is empty. Nothing to render.")
             return
 
-        final_timeline = mp.concatenate_videoclips(self.timeline_clips, method="compose")
-
-        # Add all overlays on top of the main timeline
-        composed_layers = [final_timeline] + self.overlay_clips
-        final_video = mp.CompositeVideoClip(composed_layers, size=self.size)
+        if all(tuple(c.size) == tuple(self.size) for c in self.timeline_clips):
+            # Every timeline clip is letterboxed to the canvas, so the frames can simply be chained
+            # instead of re-composited. The timeline is the opaque bottom layer, so masks are dropped.
+            unmasked = [c.set_mask(None) if c.mask is not None else c for c in self.timeline_clips]
+            final_timeline = mp.concatenate_videoclips(unmasked, method="chain")
+        else:
+            final_timeline = mp.concatenate_videoclips(self.timeline_clips, method="compose")
 
-        # Ensure audio from timeline is preserved if present
-        if final_timeline.audio is not None:
-            final_video = final_video.set_audio(final_timeline.audio)
+        # Blend the static overlays straight into the timeline frames rather than compositing
+        # them as extra layers; fl keeps the timeline's audio.
+        overlays = [_BakedOverlay(spec, self.size) for spec in self.overlay_specs]
+        if overlays:
+            final_video = final_timeline.fl(_OverlayBlender(overlays, tuple(final_timeline.size)))
+        else:
+            final_video = final_timeline
+        if self.overlay_clips:
+            final_video = mp.CompositeVideoClip([final_video] + self.overlay_clips, size=self.size)
+        # A single straight-through render never requests the same frame twice, so make sure
+        # the final clip does not memoize frames (MoviePy's only frame cache) while writing.
+        final_video.memoize = False
 
         # Write output
+        encoder = self._video_encoder()
         final_video.write_videofile(
             self.output_path,
             fps=self.fps,
-            codec="libx264",
+            codec=encoder.codec,
             audio_codec="aac",
             threads=4,
-            preset="medium",
+            preset=encoder.preset or "medium",
+            ffmpeg_params=encoder.moviepy_params(),
         )
 
+    def render_ffmpeg(self, segmented: bool = False, workers: Optional[int] = None) -> None:
+        """Renders the timeline and overlays natively with ffmpeg.
+
+        Each timeline entry becomes an ffmpeg input (still images are looped, clips are seeked
+        with -ss/-t), normalized with scale/pad and joined with the concat filter, topped with
+        time-gated overlay filters. No frames pass through Python, so this is much faster than
+        render(), which remains available as a fallback. MoviePy clips appended to
+        overlay_clips cannot be expressed as ffmpeg filters, so they raise ValueError here.
+
+        With segmented=True each timeline entry is encoded to its own temporary file by up to
+        ``workers`` parallel ffmpeg processes (default: one per CPU), and the files are joined
+        with ffmpeg's concat demuxer. Overlays that fit inside one entry are burned into that
+        entry's encode; the join is a stream copy unless some overlay spans entries, in which
+        case only those overlays are applied in a final pass. Title screens and freeze frames
+        are encoded as still images (libx264 ``-tune stillimage``).
+        """
+        if not self.timeline_segments:
+            print("Timeline is empty. Nothing to render.")
+            return
+        if self.overlay_clips:
+            raise ValueError("overlay_clips holds MoviePy clips, which only render() can draw.")
+
+        with tempfile.TemporaryDirectory(prefix="kinopy_") as tmpdir:
+            if segmented and len(self.timeline_segments) > 1:
+                self._render_ffmpeg_segmented(tmpdir, workers or os.cpu_count() or 1)
+            else:
+                subprocess.run(self._ffmpeg_command(tmpdir), check=True)
+
+    def _has_audio(self) -> bool:
+        return any(isinstance(seg, _FileSegment) and seg.has_audio for seg in self.timeline_segments)
+
+    def _ffmpeg_base_command(self, stats: bool = True) -> list[str]:
+        cmd = [get_setting("FFMPEG_BINARY"), "-y", "-hide_banner", "-loglevel", "error"]
+        cmd.append("-stats" if stats else "-nostats")
+        return cmd + self._video_encoder().global_args
+
+    def _ffmpeg_output_filter(self) -> str:
+        return self._video_encoder().output_filter(self.size)
+
+    def _ffmpeg_encode_args(self, with_audio: bool, still: bool = False) -> list[str]:
+        args = self._video_encoder().codec_args(still) + ["-r", str(self.fps)]
+        if with_audio:
+            args += ["-c:a", "aac", "-ar", "44100", "-ac", "2"]
+        return args
+
+    def _segment_input_args(self, seg: Union[_StillSegment, _FileSegment], index: int, tmpdir: str) -> list[str]:
+        """ffmpeg input options for one timeline entry; stills are written to tmpdir as PNG."""
+        if isinstance(seg, _StillSegment):
+            png = os.path.join(tmpdir, f"segment{index}.png")
+            seg.image.save(png)
+            return ["-loop", "1", "-framerate", str(self.fps), "-t", f"{seg.duration:.6f}", "-i", png]
+        return ["-ss", f"{seg.start_time:.6f}", "-t", f"{seg.duration:.6f}", "-i", seg.filepath]
 
+    def _segment_filters(
+        self,
+        seg: Union[_StillSegment, _FileSegment],
+        input_index: int,
+        label: str,
+        with_audio: bool,
+    ) -> list[str]:
+        """Filtergraph chains conforming one timeline entry to the canvas as [v<label>] / [a<label>]."""
+        width, height = self.size
+        pad_color = _ffmpeg_color(seg.letterbox_bg if isinstance(seg, _FileSegment) else (0, 0, 0))
+        chain = [
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color={pad_color}",
+            "setsar=1",
+            f"fps={self.fps}",
+            f"trim=duration={seg.duration:.6f}",
+            "setpts=PTS-STARTPTS",
+        ]
+        if not _is_even_size(self.size):
+            # Chroma-subsampled frames cannot be padded to an odd size
+            chain.insert(0, "format=yuv444p")
+        if isinstance(seg, _FileSegment):
+            if seg.fade_in > 0:
+                chain.append(f"fade=t=in:st=0:d={seg.fade_in:.6f}")
+            if seg.fade_out > 0:
+                chain.append(f"fade=t=out:st={max(0.0, seg.duration - seg.fade_out):.6f}:d={seg.fade_out:.6f}")
+        filters = [f"[{input_index}:v]" + ",".join(chain) + f"[v{label}]"]
+
+        if with_audio:
+            audio_format = "aformat=sample_fmts=fltp:sample_rates=44100:channel_layouts=stereo"
+            if isinstance(seg, _FileSegment) and seg.has_audio:
+                filters.append(
+                    f"[{input_index}:a]aresample=44100,{audio_format},apad,"
+                    f"atrim=duration={seg.duration:.6f},asetpts=PTS-STARTPTS[a{label}]"
+                )
+            else:
+                filters.append(
+                    f"anullsrc=channel_layout=stereo:sample_rate=44100,{audio_format},"
+                    f"atrim=duration={seg.duration:.6f}[a{label}]"
+                )
+        return filters
+
+    def _write_overlay_pngs(self, tmpdir: str) -> list[str]:
+        """Write every overlay spec to tmpdir as an RGBA PNG, returning the paths in spec order."""
+        paths = []
+        for k, spec in enumerate(self.overlay_specs):
+            png = os.path.join(tmpdir, f"overlay{k}.png")
+            Image.fromarray(np.dstack((spec.rgb, spec.alpha)), "RGBA").save(png)
+            paths.append(png)
+        return paths
+
+    def _overlay_filters(
+        self,
+        overlays: list[Tuple[str, _OverlaySpec]],
+        first_input: int,
+        base_label: str,
+        time_offset: float = 0.0,
+    ) -> Tuple[list[str], list[str], str]:
+        """Chain time-gated overlay filters for (png_path, spec) pairs on top of [base_label].
+
+        Overlay times are shifted by -time_offset, for graphs that start partway into the
+        timeline. Returns the extra input options, the filter chains and the final video label.
+
+        Overlays are enabled on frame numbers rather than t, matching render()'s
+        ``start <= t < end`` exactly; t after concat is in microseconds and can round just below
+        a frame time, and between() would also include the end frame.
+        """
+        inputs: list[str] = []
+        filters: list[str] = []
+        current = base_label
+        # overlay blends in 4:2:0 by default, which cannot represent an odd-sized canvas
+        blend_format = "" if _is_even_size(self.size) else "format=yuv444:"
+        for k, (png, spec) in enumerate(overlays):
+            inputs += ["-i", png]
+            x, y = spec.position
+            # First frame at or after the start, last frame before the end
+            first = math.ceil((spec.start_time - time_offset) * self.fps - 1e-6)
+            last = math.ceil((spec.end_time - time_offset) * self.fps - 1e-6) - 1
+            filters.append(
+                f"[{current}][{first_input + k}:v]overlay=x={x}:y={y}:{blend_format}"
+                f"enable='between(n,{first},{last})'[ov{k}]"
+            )
+            current = f"ov{k}"
+        return inputs, filters, current
+
+    def _ffmpeg_command(self, tmpdir: str) -> list[str]:
+        """Build the single-pass ffmpeg command line for render_ffmpeg."""
+        with_audio = self._has_audio()
+        inputs: list[str] = []
+        filters: list[str] = []
+        concat_pads: list[str] = []
+
+        for i, seg in enumerate(self.timeline_segments):
+            inputs += self._segment_input_args(seg, i, tmpdir)
+            filters += self._segment_filters(seg, i, str(i), with_audio)
+            concat_pads.append(f"[v{i}][a{i}]" if with_audio else f"[v{i}]")
+
+        n = len(self.timeline_segments)
+        if with_audio:
+            filters.append("".join(concat_pads) + f"concat=n={n}:v=1:a=1[vcat][aout]")
+        else:
+            filters.append("".join(concat_pads) + f"concat=n={n}:v=1:a=0[vcat]")
+
+        # Chain the overlays on top of the concatenated timeline, each one gated to its time window
+        overlays = list(zip(self._write_overlay_pngs(tmpdir), self.overlay_specs))
+        ov_inputs, ov_filters, current = self._overlay_filters(overlays, n, "vcat")
+        inputs += ov_inputs
+        filters += ov_filters
+        filters.append(f"[{current}]{self._ffmpeg_output_filter()}[vout]")
+
+        cmd = self._ffmpeg_base_command() + inputs
+        cmd += ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+        if with_audio:
+            cmd += ["-map", "[aout]"]
+        cmd += self._ffmpeg_encode_args(with_audio)
+        cmd.append(self.output_path)
+        return cmd
+
+    def _render_ffmpeg_segmented(self, tmpdir: str, workers: int) -> None:
+        """Encode timeline entries in parallel, then join them with the concat demuxer."""
+        with_audio = self._has_audio()
+        encoder = self._video_encoder()
+        if encoder is not _SOFTWARE_ENCODER:
+            # Hardware encoders only allow a few concurrent sessions
+            workers = min(workers, 2)
+        workers = max(1, min(workers, len(self.timeline_segments)))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+
+        # Overlays lying entirely within one timeline entry are burned into that entry's encode;
+        # the rest span a boundary and are applied after the join.
+        overlays = list(zip(self._write_overlay_pngs(tmpdir), self.overlay_specs))
+        per_segment: list[list[Tuple[str, _OverlaySpec]]] = [[] for _ in self.timeline_segments]
+        spanning: list[Tuple[str, _OverlaySpec]] = []
+        seg_starts = np.cumsum([0.0] + [seg.duration for seg in self.timeline_segments])
+        for png, spec in overlays:
+            for i, seg in enumerate(self.timeline_segments):
+                if seg_starts[i] - 1e-6 <= spec.start_time and spec.end_time <= seg_starts[i + 1] + 1e-6:
+                    per_segment[i].append((png, spec))
+                    break
+            else:
+                spanning.append((png, spec))
+
+        commands: list[list[str]] = []
+        segment_paths: list[str] = []
+        for i, seg in enumerate(self.timeline_segments):
+            path = os.path.join(tmpdir, f"segment{i}.mp4")
+            inputs = self._segment_input_args(seg, i, tmpdir)
+            filters = self._segment_filters(seg, 0, "", with_audio)
+            ov_inputs, ov_filters, current = self._overlay_filters(per_segment[i], 1, "v", seg_starts[i])
+            filters += ov_filters
+            filters.append(f"[{current}]{self._ffmpeg_output_filter()}[vout]")
+
+            cmd = self._ffmpeg_base_command(stats=False) + inputs + ov_inputs
+            cmd += ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+            if with_audio:
+                cmd += ["-map", "[a]"]
+            # A still segment is one image repeated, so the encoder is tuned for near-empty P-frames
+            still = isinstance(seg, _StillSegment) and not per_segment[i]
+            cmd += self._ffmpeg_encode_args(with_audio, still=still)
+            cmd += ["-threads", str(threads), path]
+            commands.append(cmd)
+            segment_paths.append(path)
+
+        # Each job is a separate ffmpeg process, so threads are enough to keep every core busy
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(lambda c: subprocess.run(c, check=True), commands):
+                pass
+
+        list_path = os.path.join(tmpdir, "concat.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for path, seg in zip(segment_paths, self.timeline_segments):
+                f.write("file '{}'\n".format(path.replace("'", "'\\''")))
+                # Each file's container duration includes its AAC tail, so pin the nominal length
+                # or every boundary would push later segments (and spanning overlays) out of sync
+                f.write(f"duration {seg.duration:.6f}\n")
+
+        cmd = self._ffmpeg_base_command() + ["-f", "concat", "-safe", "0", "-i", list_path]
+        if not spanning:
+            # All segments share codec parameters, so joining them is a pure stream copy
+            cmd += ["-c", "copy", self.output_path]
+        else:
+            ov_inputs, filters, current = self._overlay_filters(spanning, 1, "0:v")
+            filters.append(f"[{current}]{self._ffmpeg_output_filter()}[vout]")
+            cmd += ov_inputs + ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+            cmd += self._ffmpeg_encode_args(with_audio=False)
+            if with_audio:
+                cmd += ["-map", "0:a", "-c:a", "copy"]
+            cmd += ["-t", f"{seg_starts[-1]:.6f}", self.output_path]
+        subprocess.run(cmd, check=True)